@@ -1 +1,10 @@
-from engine import MineSweeper, GameGraphics, GestureController
\ No newline at end of file
+import importlib
+
+from engine import MineSweeper
+
+
+def __getattr__(name):
+    # GameGraphics and GestureController need the GUI stack and are imported on first use
+    if name in ('GameGraphics', 'GestureController'):
+        return getattr(importlib.import_module('engine'), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
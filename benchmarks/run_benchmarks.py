@@ -0,0 +1,237 @@
+'''
+Benchmark suite for the game engine, the renderer and the gesture pipeline.
+
+Runs without a camera or a display: the gesture pipeline is fed with the recorded samples
+in keypoint.csv and point_history.csv instead of webcam frames.
+
+    python benchmarks/run_benchmarks.py                     # run and compare with baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline     # store the results as the new baseline
+    python benchmarks/run_benchmarks.py --filter engine     # only run matching cases
+
+The script exits with status 1 if any case is slower than the baseline by more than
+--threshold.
+'''
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from functools import partial, lru_cache
+
+benchmark_directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchmark_directory))
+
+from engine import MineSweeper
+from engine.minesweeper import GAME_DIFFICULTY_SETTING
+
+BASELINE = os.path.join(benchmark_directory, 'baseline.json')
+SEED = 20220906
+BOARDS = {difficulty: {'difficulty': difficulty} for difficulty in GAME_DIFFICULTY_SETTING}
+BOARDS.update({
+    'Custom-100x100': {'size': (100, 100), 'mines': 2000},
+    'Custom-500x500': {'size': (500, 500), 'mines': 50000},
+})
+
+
+def timeit(func, setup=None, calls=200, minCalls=5, maxTime=2.0):
+    """
+    Time func individually per call so that setup, which prepares fresh state for every
+    call, is excluded. Runs `calls` times, or as many as fit in `maxTime` seconds but at
+    least `minCalls` times for slow cases. Returns per-call timings in seconds.
+    """
+    timings = []
+    t0 = time.perf_counter()
+    while len(timings) < minCalls or (len(timings) < calls and time.perf_counter() - t0 < maxTime):
+        arg = setup() if setup else None
+        t = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - t)
+    return timings
+
+
+def freshGame(board):
+    game = MineSweeper(seed=SEED, **BOARDS[board])
+    size = game.getBoardSize()
+    return game, (size.row // 2, size.col // 2)
+
+
+def startedGame(board):
+    game, center = freshGame(board)
+    game.judge(center)
+    return game
+
+
+def minedGame(board):
+    game, center = freshGame(board)
+    game.generateMineField(center)
+    return game, center
+
+
+# Every case is yielded as (name, build) where build() returns (func, setup), so fixtures and
+# the renderer and classifier imports (OpenCV, TensorFlow) are only set up for selected cases.
+
+def engineCases():
+    for board in BOARDS:
+        yield (f'engine/generateMineField/{board}', lambda board=board: (
+            lambda args: args[0].generateMineField(args[1]), partial(freshGame, board)))
+        yield (f'engine/clearmask/{board}', lambda board=board: (
+            lambda args: args[0].clearmask(args[1]), partial(minedGame, board)))
+        yield (f'engine/judge/{board}', lambda board=board: (
+            lambda args: args[0].judge(args[1]), partial(freshGame, board)))
+        yield (f'engine/generatePlayerBoard/{board}', lambda board=board: (
+            lambda game: game.generatePlayerBoard(), partial(startedGame, board)))
+
+
+@lru_cache(maxsize=None)
+def renderedBoard(board):
+    from engine.graphics import GameGraphics, DEFAULT_SYSTEM
+    game = startedGame(board)
+    # renderer results only compare across runs with the same screen profile
+    graphics = GameGraphics(game.getBoardSize(), system=DEFAULT_SYSTEM)
+    graphics.enableFocusBox()
+    graphics.setFocusBox((0, 0))
+    return graphics, game.getPlayerBoard()
+
+
+def drawFull(board):
+    graphics, playerBoard = renderedBoard(board)
+    return lambda _: graphics.drawGameBoard(playerBoard), None
+
+
+def drawOverlay(board):
+    graphics, _ = renderedBoard(board)
+    return lambda _: graphics.drawGameBoard(), None
+
+
+def rendererCases():
+    for board in BOARDS:
+        yield (f'renderer/drawGameBoard/full/{board}', partial(drawFull, board))
+        yield (f'renderer/drawGameBoard/overlay/{board}', partial(drawOverlay, board))
+
+
+def readSamples(path, limit=500):
+    import numpy as np
+    with open(path, newline='') as fp:
+        return [np.array(row[1:], dtype=np.float32) for _, row in zip(range(limit), csv.reader(fp))]
+
+
+def cycle(samples):
+    state = {'i': 0}
+
+    def nextSample():
+        state['i'] = (state['i'] + 1) % len(samples)
+        return samples[state['i']]
+    return nextSample
+
+
+def keypointSamples():
+    from engine.models import keypointDataCSV
+    return readSamples(keypointDataCSV)
+
+
+def pointHistorySamples():
+    from engine.models import pointhistoryDataCSV
+    return readSamples(pointhistoryDataCSV)
+
+
+def keypointClassifier():
+    from engine.models import KeyPointClassifier
+    return KeyPointClassifier(), cycle(keypointSamples())
+
+
+def pointHistoryClassifier():
+    from engine.models import PointHistoryClassifier
+    return PointHistoryClassifier(), cycle(pointHistorySamples())
+
+
+def vectorizeLandmarkArray():
+    from engine import GestureController
+    landmarkArrays = [sample.reshape(-1, 2) for sample in keypointSamples()]
+    # the vectorization helpers do not use any controller state, so they are called unbound
+    # to avoid setting up MediaPipe
+    return lambda arr: GestureController.vectorizeLandmarkArray(None, arr), cycle(landmarkArrays)
+
+
+def vectorizePointHistory():
+    from engine import GestureController
+    pointHistoryLists = [sample.reshape(-1, 2).tolist() for sample in pointHistorySamples()]
+    return lambda hist: GestureController.vectorizePointHistory(None, hist), cycle(pointHistoryLists)
+
+
+def gestureCases():
+    yield ('gesture/KeyPointClassifier', keypointClassifier)
+    yield ('gesture/PointHistoryClassifier', pointHistoryClassifier)
+    yield ('gesture/vectorizeLandmarkArray', vectorizeLandmarkArray)
+    yield ('gesture/vectorizePointHistory', vectorizePointHistory)
+
+
+def runBenchmarks(pattern=None):
+    results = {}
+    for group in (engineCases, rendererCases, gestureCases):
+        for name, build in group():
+            if pattern and pattern not in name:
+                continue
+            func, setup = build()
+            timings = timeit(func, setup)
+            results[name] = {
+                'calls': len(timings),
+                'median_us': statistics.median(timings) * 1e6,
+                'min_us': min(timings) * 1e6,
+            }
+            print(f'{name:<50} {results[name]["median_us"]:>12.1f} us')
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['median_us'] / baseline[name]['median_us']
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = 'REGRESSION'
+        print(f'{name:<50} {ratio:>8.2f}x {flag}')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MineSweeper benchmark suite')
+    parser.add_argument('--output', default='benchmark_results.json', help='file to write results to')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative slowdown of the median before flagging a regression')
+    parser.add_argument('--filter', default=None, help='only run cases whose name contains this string')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': runBenchmarks(args.filter),
+    }
+    with open(args.output, 'w') as fp:
+        json.dump(report, fp, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as fp:
+            json.dump(report, fp, indent=2)
+        print(f'baseline saved to {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)['results']
+        print(f'\ncompared with {args.baseline} (threshold {args.threshold:.0%})')
+        regressions = compare(report['results'], baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+            sys.exit(1)
+    else:
+        print(f'no baseline at {args.baseline}, run with --save-baseline to create one')
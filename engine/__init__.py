@@ -1,7 +1,22 @@
 """
 MineSweeper game engine.
 """
+import importlib
+
 from .minesweeper import MineSweeper
-from .graphics import GameGraphics
-from .gesturecontroller import GestureController
-from .gameplay import GamePlay
+from .server import GameServer
+from .savegame import MoveLog, saveGame, loadGame
+
+# the GUI and gesture modules pull in OpenCV, MediaPipe and TensorFlow, so they are only
+# imported on first use to keep the server and replay tools usable on headless machines
+_lazyImports = {
+    'GameGraphics': '.graphics',
+    'GestureController': '.gesturecontroller',
+    'GamePlay': '.gameplay',
+}
+
+
+def __getattr__(name):
+    if name in _lazyImports:
+        return getattr(importlib.import_module(_lazyImports[name], __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -15,9 +15,9 @@ class CoolDown:
         return (time.time() - self.t0) >= self.coolDownDuration
 
 class GamePlay:
-    def __init__(self, difficulty='Easy'):
-        self.game = MineSweeper(difficulty=difficulty)
-        self.gamegui = GameGraphics(self.game.getBoardSize())
+    def __init__(self, difficulty='Easy', size=None, mines=None, system=None):
+        self.game = MineSweeper(difficulty=difficulty, size=size, mines=mines)
+        self.gamegui = GameGraphics(self.game.getBoardSize(), system=system)
         self.mouseEvent = None
         self.boardSize = self.gamegui.boardImg.shape
         self.windowName = 'MineSweeper'
@@ -33,14 +33,14 @@ class GamePlay:
         self.lastExecutedCommand = None
         paused = False
         while True:
-            x, y, _, _ = cv2.getWindowImageRect(self.windowName)
+            x, y, w, h = cv2.getWindowImageRect(self.windowName)
             """
             For whatever reason, imshow displays image at an arbitrary resolution.
             Also the function getWindowImageRect does not return the correct coordinate or window size
             even when the window gets resized. The dimension of the window stays the same as the display
             image. Therefore I can get y+h > screen height. This seems to be a problem with MacOS.
             """
-            self.gamegui.setGameWindowTopLeftCoord(x, y) # get the top-left corner y-axis coordinate value
+            self.gamegui.setGameWindowTopLeftCoord(x, y, w, h) # get the top-left corner y-axis coordinate value
             # print(self.gestureController.currentCommand())
             key = cv2.waitKey(1) & 0xFF
             if key == 27:
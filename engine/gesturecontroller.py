@@ -5,19 +5,21 @@ import threading
 import csv
 import numpy as np
 
-from .models import KeyPointClassifier, PointHistoryClassifier, keypointCSV, pointhistoryCSV
+from .models import KeyPointClassifier, PointHistoryClassifier, keypointCSV, pointhistoryCSV, CLASSIFIER_SETTING
 
 
 class GestureController:
     pointHistoryLength = 16
-    def __init__(self, debug=False) -> None:
+    def __init__(self, debug=False, modelVariant=None, numThreads=None) -> None:
+        modelVariant = modelVariant or CLASSIFIER_SETTING['variant']
+        numThreads = numThreads or CLASSIFIER_SETTING['num_threads']
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             max_num_hands=1, 
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5)
-        self.handGestureClassifier = KeyPointClassifier()
-        self.fingerGestureClassifier = PointHistoryClassifier()
+        self.handGestureClassifier = KeyPointClassifier(variant=modelVariant, num_threads=numThreads)
+        self.fingerGestureClassifier = PointHistoryClassifier(variant=modelVariant, num_threads=numThreads)
         self.handGestureLabels = self.readHandGestureLabels()
         self.fingerGestureLabels = self.readFingerGestureLabels()
         self.stop = False
@@ -1,6 +1,8 @@
 import cv2
 import os
+import sys
 import csv
+import functools
 import numpy as np
 from collections import namedtuple
 
@@ -10,24 +12,105 @@ GameSize = namedtuple('Size', ['row', 'col'])
 
 module_directory = os.path.dirname(os.path.abspath(__file__))
 SCREEN_RESOLUTION = {
-    'MBP-13 2020': [2560, 1600]
+    'MBP-13 2020': [2560, 1600],
+    'HD': [1366, 768],
+    'FHD': [1920, 1080],
+    'QHD': [2560, 1440],
+    '4K UHD': [3840, 2160],
 }
+DEFAULT_SYSTEM = 'MBP-13 2020'
+TEXTURE_SIZE = 200  # size of a cell texture in textures.png
+textureFile = os.path.join(module_directory, 'sprites', 'textures.png')
+textureMap = os.path.join(module_directory, 'sprites', 'texturemap.txt')
+
+
+def screenResolution(system):
+    """
+    Look up a SCREEN_RESOLUTION profile by name or parse a 'WIDTHxHEIGHT' string.
+    """
+    if system in SCREEN_RESOLUTION:
+        return ImgSize(*SCREEN_RESOLUTION[system])
+    try:
+        width, height = (int(v) for v in system.lower().split('x'))
+    except ValueError:
+        raise ValueError(f'unknown screen profile {system}, expected one of '
+                         f'{list(SCREEN_RESOLUTION)} or WIDTHxHEIGHT') from None
+    return ImgSize(width, height)
+
+
+def detectScreenResolution():
+    """
+    Use the MINESWEEPER_SCREEN environment variable (a profile name or WIDTHxHEIGHT) if set,
+    otherwise ask the display server through Tk. Falls back to the default profile.
+    """
+    system = os.environ.get('MINESWEEPER_SCREEN')
+    if system:
+        return screenResolution(system)
+    # Tk reports scaled points rather than pixels on Retina displays
+    if sys.platform != 'darwin':
+        try:
+            import tkinter
+            root = tkinter.Tk()
+            root.withdraw()
+            size = ImgSize(root.winfo_screenwidth(), root.winfo_screenheight())
+            root.destroy()
+            return size
+        except ImportError:
+            pass
+        except tkinter.TclError:
+            # no display available, e.g. when running headless
+            pass
+    return ImgSize(*SCREEN_RESOLUTION[DEFAULT_SYSTEM])
+
+
+@functools.lru_cache(maxsize=None)
+def loadTextureAtlas():
+    with open(textureMap, 'r', newline='') as fp:
+        csvreader = csv.reader(fp, delimiter=',')
+        try:
+            textureMapping = {
+                row[0]: [int(row[1]), int(row[2])] for row in csvreader}
+        except:
+            print('Failed to load texture mapping.')
+            exit(1)
+
+    _textureImg = cv2.imread(textureFile, cv2.IMREAD_COLOR)
+    return {tName: _textureImg[coord[0]:coord[0]+TEXTURE_SIZE,
+                               coord[1]:coord[1]+TEXTURE_SIZE]
+            for tName, coord in textureMapping.items()}
+
+
+@functools.lru_cache(maxsize=32)
+def cellTextures(screenSize, gameSize):
+    """
+    Cell size and textures scaled to it for a board on a screen. Cached so that they are only
+    computed once per screen profile and board size.
+    """
+    # determine texture size from screen resolution and board configuration
+    cellSize = max(1, int(min(screenSize.height * 0.8 // gameSize.row,
+                              screenSize.width * 0.9 // gameSize.col)))
+    interpolation = cv2.INTER_AREA if cellSize < TEXTURE_SIZE else cv2.INTER_LINEAR
+    textures = {tName: cv2.resize(img, [cellSize, cellSize], interpolation=interpolation)
+                for tName, img in loadTextureAtlas().items()}
+    return cellSize, textures
 
 
 class GameGraphics:
-    textureFile = os.path.join(module_directory, 'sprites', 'textures.png')
-    textureMap = os.path.join(module_directory, 'sprites', 'texturemap.txt')
-
-    def __init__(self, gameSize, system='MBP-13 2020'):
+    def __init__(self, gameSize, system=None):
+        """
+        :param gameSize: (row, col) of the game board
+        :param system: a SCREEN_RESOLUTION profile name or 'WIDTHxHEIGHT', detected if None
+        """
         self.system = system
-        self.gameSize = gameSize
-        self.cellSize = 200
+        self.gameSize = GameSize(*gameSize)
+        self.cellSize = TEXTURE_SIZE
         self.boardImg = None
         self.boardSize = None
-        self.screenSize = ImgSize(*SCREEN_RESOLUTION[self.system])
+        self.screenSize = detectScreenResolution() if system is None else screenResolution(system)
         self.drawFocusBox = False
         self.focusBox = (0, 0)
         self.windowTopLeftCorner = None
+        self.windowSize = None
         self.lastCommand = None
         self.gameStatusText = ''
         self.debugInfo = True
@@ -35,26 +118,7 @@ class GameGraphics:
         self.gameBoardInit()
 
     def loadTextures(self):
-        with open(self.textureMap, 'r', newline='') as fp:
-            csvreader = csv.reader(fp, delimiter=',')
-            try:
-                textureMapping = {
-                    row[0]: [int(row[1]), int(row[2])] for row in csvreader}
-            except:
-                print('Failed to load texture mapping.')
-                exit(1)
-
-        _textureImg = cv2.imread(self.textureFile, cv2.IMREAD_COLOR)
-        _textures = {tName: _textureImg[coord[0]:coord[0]+self.cellSize,
-                                        coord[1]:coord[1]+self.cellSize]
-                     for tName, coord in textureMapping.items()}
-
-        # determine texture size from screen resolution and board configuration
-        cellSize = int(min(self.screenSize.height * 0.8 // (self.gameSize.row),
-                       self.screenSize.width * 0.9 // (self.gameSize.col)))
-        self.cellSize = cellSize
-        self.textures = {tName: cv2.resize(
-            img, [cellSize, cellSize]) for tName, img in _textures.items()}
+        self.cellSize, self.textures = cellTextures(self.screenSize, self.gameSize)
 
     def gameBoardInit(self):
         self.boardImg = np.zeros((self.gameSize.row * self.cellSize,
@@ -117,16 +181,23 @@ class GameGraphics:
     def gameStatusText(self, text):
         self.gameStatusText = text
 
-    def setGameWindowTopLeftCoord(self, x, y):
-        y = self.screenSize.height - self.boardSize.height - y
+    def setGameWindowTopLeftCoord(self, x, y, width=None, height=None):
+        # the window may show the board scaled, e.g. on HiDPI screens
+        self.windowSize = ImgSize(width, height) if width and height else self.boardSize
+        if sys.platform == 'darwin':
+            # getWindowImageRect measures y from the bottom of the screen on macOS
+            y = self.screenSize.height - self.windowSize.height - y
         self.windowTopLeftCorner = Point(x, y)
     
     def setLastExecutedCommand(self, cmd):
         self.lastCommand = cmd
 
     def fingerInsideGameWindow(self, x, y):
-        return (self.windowTopLeftCorner.x <= x <= self.windowTopLeftCorner.x + self.boardSize.width) and \
-            (self.windowTopLeftCorner.y <= y <= self.windowTopLeftCorner.y + self.boardSize.height)
+        return (self.windowTopLeftCorner.x <= x <= self.windowTopLeftCorner.x + self.windowSize.width) and \
+            (self.windowTopLeftCorner.y <= y <= self.windowTopLeftCorner.y + self.windowSize.height)
     
     def getRelativeBoardCoord(self, x, y):
-        return (y - self.windowTopLeftCorner.y, x - self.windowTopLeftCorner.x)
+        # map screen coordinates inside the window to pixel coordinates of the board image
+        row = (y - self.windowTopLeftCorner.y) * self.boardSize.height // self.windowSize.height
+        col = (x - self.windowTopLeftCorner.x) * self.boardSize.width // self.windowSize.width
+        return (row, col)
@@ -16,6 +16,8 @@ GAME_DIFFICULTY_SETTING = {
     'Intermediate': [(16, 16), 40],
     'Hard': [(16, 30), 99]
 }
+# boards of any size up to this limit can be created with MineSweeper(size=..., mines=...)
+MAX_BOARD_DIMENSION = 65535
 
 
 class MineSweeper():
@@ -28,17 +30,34 @@ class MineSweeper():
     MASKED = 1
     UNMASKED = 0
 
-    def __init__(self, difficulty='Easy') -> None:
+    def __init__(self, difficulty='Easy', seed=None, size=None, mines=None) -> None:
         """
         Initialize a new Minesweeper game
-        :param size: the width and the length of the game map
-        :param mines: the number of mines for the game 
+        :param difficulty: one of the presets in GAME_DIFFICULTY_SETTING
+        :param seed: seed for the mine placement, a random one is drawn if None
+        :param size: (row, col) of a custom board, overrides difficulty
+        :param mines: the number of mines on a custom board
         :return: None
         """
-        self.boardSize = GameSize(*GAME_DIFFICULTY_SETTING[difficulty][0])
-        self.mineCount = GAME_DIFFICULTY_SETTING[difficulty][1]
-        self.difficulty = difficulty
-        self.reset()
+        if size is not None:
+            rows, cols = size
+            if not all(isinstance(n, int) and not isinstance(n, bool) for n in (rows, cols, mines)):
+                raise TypeError(f'board size and mines must be integers, got {size} and {mines}')
+            if not (0 < rows <= MAX_BOARD_DIMENSION and 0 < cols <= MAX_BOARD_DIMENSION):
+                raise ValueError(f'board size must be between 1 and {MAX_BOARD_DIMENSION} '
+                                 f'in each dimension, got {rows}x{cols}')
+            # mines are kept out of the first clicked cell's row and column
+            if not 0 <= mines <= (rows - 1) * (cols - 1):
+                raise ValueError(f'a {rows}x{cols} board holds between 0 and '
+                                 f'{(rows - 1) * (cols - 1)} mines, got {mines}')
+            self.boardSize = GameSize(rows, cols)
+            self.mineCount = mines
+            self.difficulty = 'Custom'
+        else:
+            self.boardSize = GameSize(*GAME_DIFFICULTY_SETTING[difficulty][0])
+            self.mineCount = GAME_DIFFICULTY_SETTING[difficulty][1]
+            self.difficulty = difficulty
+        self.reset(seed)
 
     @property
     def status(self):
@@ -49,7 +68,14 @@ class MineSweeper():
         else:
             return 'playing'
 
-    def reset(self):
+    def reset(self, seed=None):
+        # the seed together with the first click fully determines the mine field
+        if seed is None:
+            seed = random.getrandbits(63)
+        elif not (isinstance(seed, int) and 0 <= seed < 2 ** 64):
+            # snapshots and move logs store the seed as an unsigned 64-bit integer
+            raise ValueError(f'seed must be an integer between 0 and 2**64 - 1, got {seed}')
+        self.seed = seed
         self._mask = [[self.MASKED] * self.boardSize.col
                       for _ in range(self.boardSize.row)]
         self._field = [[0] * self.boardSize.col
@@ -58,11 +84,26 @@ class MineSweeper():
                          for _ in range(self.boardSize.row)]
         self._mines = None
         self._numbers = set()
+        self._changes = {}
+        # cells whose display value may be outdated; _boardStale forces a full refresh instead
+        self._staleCells = set()
+        self._boardStale = False
         self._status = self.INIT
 
     def getPlayerBoard(self):
+        self.refreshPlayerBoard()
         return self._display
 
+    def getChangedCells(self):
+        """
+        Return the cells of the player board that changed since the last call as a list of
+        (row, col, value) tuples, and start tracking anew.
+        """
+        self.refreshPlayerBoard()
+        changes = [(r, c, v) for (r, c), v in self._changes.items()]
+        self._changes = {}
+        return changes
+
     def getBoardSize(self):
         return self.boardSize
 
@@ -73,41 +114,67 @@ class MineSweeper():
         This function is called at the first user input. The mines are generated at least two cells
         away from the user input coordinate.
         """
-        _mines = set()
         r, c = coord
+        rng = random.Random(self.seed)
         # set the distance to the nearest mine based on difficulty
-        distance_to_mine = 1 if self.difficulty == 'Hard' else 2
-        # repeatedly generate mines until enough qualified ones have been generated.
-        while len(_mines) < self.mineCount:
-            row, col = random.randrange(
-                0, self.boardSize.row), random.randrange(0, self.boardSize.col)
-            if abs(row - r) >= distance_to_mine and abs(col - c) >= distance_to_mine:
-                _mines.add((row, col))
+        distance_to_mine = 2 if self.difficulty in ['Easy', 'Intermediate'] else 1
+        # the eligible cells are the product of the eligible rows and columns, so mines are drawn
+        # as indices into it without building the list of cells
+        rows = [row for row in range(self.boardSize.row) if abs(row - r) >= distance_to_mine]
+        cols = [col for col in range(self.boardSize.col) if abs(col - c) >= distance_to_mine]
+        _mines = {(rows[i // len(cols)], cols[i % len(cols)])
+                  for i in rng.sample(range(len(rows) * len(cols)), self.mineCount)}
+        self.placeMines(_mines)
 
+    def placeMines(self, mines):
+        """
+        Place the given mine coordinates on an empty field and compute the numbers around them.
+        """
+        field = self._field
+        rows, cols = self.boardSize
         # place the mines on the board
-        for mine in _mines:
+        for mine in mines:
             r, c = mine
-            self._field[r][c] = '*'
+            field[r][c] = '*'
         # All mines must be placed first before calculating the numbers.
-        for mine in _mines:
+        for mine in mines:
             r, c = mine
             for (row, col) in self._neighbors(r, c):
-                if 0 <= row < self.boardSize.row and 0 <= col < self.boardSize.col and \
-                        self._field[row][col] != '*':
-                    self._field[row][col] += 1
+                if 0 <= row < rows and 0 <= col < cols and field[row][col] != '*':
+                    field[row][col] += 1
                     self._numbers.add((row, col))
 
-        self._mines = _mines  # store coordinates of the mines
+        self._mines = mines  # store coordinates of the mines
 
     def generatePlayerBoard(self):
+        self._boardStale = False
+        self._staleCells = set()
         for r in range(self.boardSize.row):
             for c in range(self.boardSize.col):
-                if self._mask[r][c] == self.MASKED:
-                    self._display[r][c] = '?'
-                elif self._mask[r][c] == self.FLAGGED:
-                    self._display[r][c] = 'F'
-                else:
-                    self._display[r][c] = self._field[r][c]
+                self._updateDisplayCell(r, c)
+
+    def refreshPlayerBoard(self):
+        """
+        Bring the player board up to date, only revisiting the cells touched since the last
+        refresh unless the whole board changed.
+        """
+        if self._boardStale:
+            self.generatePlayerBoard()
+            return
+        for (r, c) in self._staleCells:
+            self._updateDisplayCell(r, c)
+        self._staleCells = set()
+
+    def _updateDisplayCell(self, r, c):
+        if self._mask[r][c] == self.MASKED:
+            value = '?'
+        elif self._mask[r][c] == self.FLAGGED:
+            value = 'F'
+        else:
+            value = self._field[r][c]
+        if self._display[r][c] != value:
+            self._display[r][c] = value
+            self._changes[(r, c)] = value
 
     def showBoard(self, masked=True):
         self.generatePlayerBoard()
@@ -140,12 +207,12 @@ class MineSweeper():
             if len(self._numbers) == 0:
                 self._status = self.WON
                 self.unmaskAll()
-        self.generatePlayerBoard()
         return True
 
     def unmaskAll(self):
         self._mask = [[self.UNMASKED]*self.boardSize.col
                       for _ in range(self.boardSize.row)]
+        self._boardStale = True
 
     def flagCell(self, coord):
         if self._status in [self.WON, self.LOST, self.INIT]:
@@ -159,25 +226,58 @@ class MineSweeper():
             self._mask[r][c] = self.FLAGGED
         elif self._mask[r][c] == self.FLAGGED:
             self._mask[r][c] = self.MASKED
-        self.generatePlayerBoard()
+        self._staleCells.add((r, c))
+        return True
+
+    def chordCell(self, coord):
+        """
+        Open all masked neighbors of an unmasked number cell once the number of flags around it
+        matches its number. An incorrectly placed flag causes a mine to be opened.
+        """
+        if self._status != self.PLAYING:
+            return False
+        r, c = coord
+        if self._mask[r][c] != self.UNMASKED or self._field[r][c] == 0:
+            return False
+        neighbors = [(nr, nc) for (nr, nc) in self._neighbors(r, c)
+                     if 0 <= nr < self.boardSize.row and 0 <= nc < self.boardSize.col]
+        flags = sum(1 for (nr, nc) in neighbors if self._mask[nr][nc] == self.FLAGGED)
+        if flags != self._field[r][c]:
+            return False
+        for (nr, nc) in neighbors:
+            if self._mask[nr][nc] != self.MASKED:
+                # cells may have been opened by an earlier neighbor's propagation
+                continue
+            if self._field[nr][nc] == '*':
+                self.unmaskAll()
+                self._status = self.LOST
+                self._field[nr][nc] = '**'
+                break
+            self.clearmask((nr, nc))
+        if self._status == self.PLAYING and len(self._numbers) == 0:
+            self._status = self.WON
+            self.unmaskAll()
         return True
 
     def clearmask(self, coord):
         r, c = coord
         queue = deque()
         queue.append((r, c))
+        # cells are unmasked as they are queued so that each one is visited only once
+        self._mask[r][c] = self.UNMASKED
+        self._staleCells.add((r, c))
         while len(queue) > 0:
             r, c = queue.popleft()
-            self._mask[r][c] = self.UNMASKED
             if self._field[r][c] == 0:
                 # propagate around cells with 0
                 for (nr, nc) in self._neighbors(r, c):
                     if (0 <= nr < self.boardSize.row and 0 <= nc < self.boardSize.col) and\
                         self._mask[nr][nc] == self.MASKED and self._field[nr][nc] != '*':
+                        self._mask[nr][nc] = self.UNMASKED
+                        self._staleCells.add((nr, nc))
                         if self._field[nr][nc] == 0:
                             queue.append((nr, nc))
                         else:
-                            self._mask[nr][nc] = self.UNMASKED
                             self._numbers.remove((nr, nc))
             else:
                 self._numbers.remove((r, c))
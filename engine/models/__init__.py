@@ -1,4 +1,4 @@
-from .keypoint_classifier.keypoint_classifier import KeyPointClassifier
+from .keypoint_classifier.keypoint_classifier import KeyPointClassifier, keypointModels
 from .point_history_classifier.point_history_classifier import PointHistoryClassifier
 
 import os
@@ -6,3 +6,14 @@ import os
 __folder = os.path.dirname(os.path.abspath(__file__))
 keypointCSV = os.path.join(__folder, 'keypoint_classifier/keypoint_classifier_label.csv')
 pointhistoryCSV = os.path.join(__folder, 'point_history_classifier/point_history_classifier_label.csv')
+keypointDataCSV = os.path.join(__folder, 'keypoint_classifier/keypoint.csv')
+pointhistoryDataCSV = os.path.join(__folder, 'point_history_classifier/point_history.csv')
+
+CLASSIFIER_SETTING = {
+    # model variant ('float32', 'float16' or 'int8') and interpreter threads for both classifiers
+    'variant': os.environ.get('MINESWEEPER_MODEL_VARIANT', 'float32'),
+    'num_threads': int(os.environ.get('MINESWEEPER_MODEL_THREADS', 1)),
+}
+if CLASSIFIER_SETTING['variant'] not in keypointModels:
+    raise ValueError(f'MINESWEEPER_MODEL_VARIANT must be one of {list(keypointModels)}, '
+                     f'got {CLASSIFIER_SETTING["variant"]}')
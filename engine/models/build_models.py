@@ -0,0 +1,80 @@
+"""
+Build the quantized variants of the gesture classifiers from the shipped .hdf5 models.
+
+    python -m engine.models.build_models [--variants int8 float16]
+
+int8 models are fully integer quantized (weights and activations), calibrated with the
+recorded samples in keypoint.csv and point_history.csv. Their inputs and outputs stay
+float32 so they are drop-in replacements for the float32 models.
+float16 models only store the weights as float16.
+"""
+import argparse
+import csv
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from . import keypointDataCSV, pointhistoryDataCSV
+from .keypoint_classifier.keypoint_classifier import keypointModels
+from .point_history_classifier.point_history_classifier import pointhistoryModels
+
+__folder = os.path.dirname(os.path.abspath(__file__))
+CLASSIFIERS = {
+    # name: (keras model, recorded samples, output paths per variant)
+    'keypoint_classifier': (
+        os.path.join(__folder, 'keypoint_classifier/keypoint_classifier.hdf5'),
+        keypointDataCSV, keypointModels),
+    'point_history_classifier': (
+        os.path.join(__folder, 'point_history_classifier/point_history_classifier.hdf5'),
+        pointhistoryDataCSV, pointhistoryModels),
+}
+
+
+def readDataset(path):
+    """
+    Read a recorded sample file. The first column is the label, the rest is the input vector.
+    """
+    with open(path, newline='') as fp:
+        rows = [row for row in csv.reader(fp) if row]
+    labels = np.array([int(row[0]) for row in rows], dtype=np.int32)
+    samples = np.array([row[1:] for row in rows], dtype=np.float32)
+    return samples, labels
+
+
+def convert(kerasModel, variant, samples, calibrationSize=500):
+    converter = tf.lite.TFLiteConverter.from_keras_model(kerasModel)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if variant == 'int8':
+        rng = np.random.default_rng(0)
+        calibration = samples[rng.permutation(len(samples))[:calibrationSize]]
+
+        def representativeDataset():
+            for sample in calibration:
+                yield [sample[np.newaxis, :]]
+        converter.representative_dataset = representativeDataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    elif variant == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        raise ValueError(f'unknown model variant {variant}')
+    return converter.convert()
+
+
+def buildModels(variants=('int8', 'float16')):
+    for name, (kerasPath, dataPath, outputs) in CLASSIFIERS.items():
+        kerasModel = tf.keras.models.load_model(kerasPath)
+        samples, _ = readDataset(dataPath)
+        for variant in variants:
+            model = convert(kerasModel, variant, samples)
+            with open(outputs[variant], 'wb') as fp:
+                fp.write(model)
+            print(f'{name} {variant}: {len(model)} bytes -> {outputs[variant]}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build quantized gesture classifier variants')
+    parser.add_argument('--variants', nargs='+', default=['int8', 'float16'],
+                        choices=['int8', 'float16'])
+    args = parser.parse_args()
+    buildModels(args.variants)
@@ -9,15 +9,35 @@ import os
 
 __folder = os.path.dirname(os.path.abspath(__file__))
 keypointModel = os.path.join(__folder, 'keypoint_classifier.tflite')
+# quantized variants are produced from keypoint_classifier.hdf5 by engine/models/build_models.py
+keypointModels = {
+    'float32': keypointModel,
+    'float16': os.path.join(__folder, 'keypoint_classifier_float16.tflite'),
+    'int8': os.path.join(__folder, 'keypoint_classifier_int8.tflite'),
+}
 
 class KeyPointClassifier(object):
     def __init__(
         self,
-        model_path=keypointModel,
+        model_path=None,
         num_threads=1,
+        variant='float32',
+        use_xnnpack=True,
     ):
+        if model_path is None:
+            if variant not in keypointModels:
+                raise ValueError(f'unknown model variant {variant}, '
+                                 f'expected one of {list(keypointModels)}')
+            model_path = keypointModels[variant]
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f'the {variant} model {model_path} has not been built, '
+                                        'run python -m engine.models.build_models')
+        # TF Lite applies the XNNPACK delegate by default, it can be turned off for comparison
+        op_resolver_type = tf.lite.experimental.OpResolverType.AUTO if use_xnnpack else \
+            tf.lite.experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
         self.interpreter = tf.lite.Interpreter(model_path=model_path,
-                                               num_threads=num_threads)
+                                               num_threads=num_threads,
+                                               experimental_op_resolver_type=op_resolver_type)
 
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
@@ -0,0 +1,87 @@
+"""
+Compare the classifier variants on CPU: accuracy on the recorded samples, agreement with
+the float32 model, model size and per-inference latency.
+
+    python -m engine.models.model_report [--threads 1 4] [--output report.json]
+
+Variants that have not been built yet (see build_models.py) are skipped.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from functools import partial
+
+import numpy as np
+
+from . import KeyPointClassifier, PointHistoryClassifier
+from .build_models import CLASSIFIERS, readDataset
+
+CLASSES = {
+    'keypoint_classifier': KeyPointClassifier,
+    # score_th=0 compares the raw argmax, otherwise low-confidence outputs are mapped to
+    # label 0 ('Stop') and counted as correct whenever the sample is a Stop sample
+    'point_history_classifier': partial(PointHistoryClassifier, score_th=0),
+}
+
+
+def evaluate(classifier, samples, labels, latencySamples=1000):
+    predictions = np.array([classifier(sample) for sample in samples])
+    timings = []
+    for sample in samples[:latencySamples]:
+        t = time.perf_counter()
+        classifier(sample)
+        timings.append(time.perf_counter() - t)
+    return predictions, {
+        'accuracy': float(np.mean(predictions == labels)),
+        'median_us': statistics.median(timings) * 1e6,
+        'p99_us': float(np.percentile(timings, 99)) * 1e6,
+    }
+
+
+def buildReport(threadCounts=(1,), variants=('float32', 'float16', 'int8')):
+    report = []
+    for name, (_, dataPath, modelPaths) in CLASSIFIERS.items():
+        samples, labels = readDataset(dataPath)
+        reference = None
+        for variant in variants:
+            if not os.path.exists(modelPaths[variant]):
+                print(f'{name} {variant}: not built, skipped')
+                continue
+            for numThreads in threadCounts:
+                for xnnpack in (True, False):
+                    classifier = CLASSES[name](variant=variant, num_threads=numThreads,
+                                               use_xnnpack=xnnpack)
+                    predictions, result = evaluate(classifier, samples, labels)
+                    if reference is None:
+                        reference = predictions
+                    result.update(classifier=name, variant=variant, num_threads=numThreads,
+                                  xnnpack=xnnpack, size_bytes=os.path.getsize(modelPaths[variant]),
+                                  agreement=float(np.mean(predictions == reference)))
+                    report.append(result)
+    return report
+
+
+def printReport(report):
+    header = f'{"classifier":<26}{"variant":<9}{"thr":>4}{"xnn":>5}{"size KB":>9}' \
+             f'{"accuracy":>10}{"agree":>8}{"median us":>11}{"p99 us":>9}'
+    print(header)
+    print('-' * len(header))
+    for r in report:
+        print(f'{r["classifier"]:<26}{r["variant"]:<9}{r["num_threads"]:>4}{"y" if r["xnnpack"] else "n":>5}'
+              f'{r["size_bytes"] / 1024:>9.1f}{r["accuracy"]:>10.4f}{r["agreement"]:>8.4f}'
+              f'{r["median_us"]:>11.1f}{r["p99_us"]:>9.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Accuracy, size and latency report for the classifier variants')
+    parser.add_argument('--threads', nargs='+', type=int, default=[1])
+    parser.add_argument('--output', default=None, help='also write the report as JSON')
+    args = parser.parse_args()
+
+    report = buildReport(args.threads)
+    printReport(report)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
@@ -0,0 +1,254 @@
+"""
+Module implementing compact save/restore and move-log replay for MineSweeper games.
+
+Snapshot layout (little endian):
+    header   magic 'MSWP', version, difficulty index (0xFF for custom boards), rows, cols, mine count, seed,
+             status, exploded cell index + 1 (0 if none)
+    bitsets  mines, masked (masked or flagged), flagged; one bit per cell in row-major
+             order, each padded to whole bytes
+
+Move log layout:
+    header   magic 'MSWL', version, difficulty index, rows, cols, mine count, seed
+    records  op code, row, col; appended one per move
+
+A game is fully determined by its seed and the moves applied to it, so replaying a log
+reproduces the snapshot of the original game byte for byte.
+"""
+import struct
+
+from .minesweeper import MineSweeper, GAME_DIFFICULTY_SETTING
+
+SNAPSHOT_MAGIC = b'MSWP'
+MOVELOG_MAGIC = b'MSWL'
+FORMAT_VERSION = 1
+
+_snapshotHeader = struct.Struct('<4sBBHHIQBI')
+_moveLogHeader = struct.Struct('<4sBBHHIQ')
+_moveRecord = struct.Struct('<BHH')
+
+DIFFICULTIES = list(GAME_DIFFICULTY_SETTING)
+CUSTOM_DIFFICULTY = 0xFF
+# largest board (rows * cols) that will be restored, headers are checked before allocating
+MAX_CELLS = 2 ** 24
+MOVES = {
+    'click': (1, MineSweeper.judge),
+    'flag': (2, MineSweeper.flagCell),
+    'chord': (3, MineSweeper.chordCell),
+}
+_movesByCode = {code: action for code, action in MOVES.values()}
+
+
+class SaveGameError(ValueError):
+    pass
+
+
+def _difficultyCode(game):
+    return CUSTOM_DIFFICULTY if game.difficulty == 'Custom' else DIFFICULTIES.index(game.difficulty)
+
+
+def _newGame(difficulty, rows, cols, mineCount, seed, maxCells):
+    if rows * cols > maxCells:
+        raise SaveGameError(f'a {rows}x{cols} board exceeds the limit of {maxCells} cells')
+    if difficulty == CUSTOM_DIFFICULTY:
+        try:
+            return MineSweeper(seed=seed, size=(rows, cols), mines=mineCount)
+        except ValueError as e:
+            raise SaveGameError(str(e)) from e
+    if difficulty >= len(DIFFICULTIES):
+        raise SaveGameError(f'unknown difficulty {difficulty}')
+    game = MineSweeper(DIFFICULTIES[difficulty], seed=seed)
+    if tuple(game.boardSize) != (rows, cols) or game.mineCount != mineCount:
+        raise SaveGameError('board does not match its difficulty setting')
+    return game
+
+
+def _bitsetLength(game):
+    return (game.boardSize.row * game.boardSize.col + 7) // 8
+
+
+def _packBits(view, cells, cols):
+    for r, c in cells:
+        i = r * cols + c
+        view[i >> 3] |= 1 << (i & 7)
+
+
+def _unpackBits(view, rows, cols):
+    cells = []
+    for byteIndex, byte in enumerate(view):
+        while byte:
+            low = byte & -byte
+            i = (byteIndex << 3) + low.bit_length() - 1
+            byte ^= low
+            if i < rows * cols:
+                cells.append(divmod(i, cols))
+    return cells
+
+
+def dumpSnapshot(game):
+    """
+    Serialize a game into a bytearray. The bitsets are written in place through memoryview
+    slices of the output buffer.
+    """
+    rows, cols = game.boardSize
+    n = _bitsetLength(game)
+    buf = bytearray(_snapshotHeader.size + 3 * n)
+    view = memoryview(buf)
+
+    exploded = 0
+    masked, flagged = [], []
+    for r in range(rows):
+        for c in range(cols):
+            if game._field[r][c] == '**':
+                exploded = r * cols + c + 1
+            if game._mask[r][c] != MineSweeper.UNMASKED:
+                masked.append((r, c))
+                if game._mask[r][c] == MineSweeper.FLAGGED:
+                    flagged.append((r, c))
+
+    _snapshotHeader.pack_into(buf, 0, SNAPSHOT_MAGIC, FORMAT_VERSION,
+                              _difficultyCode(game), rows, cols,
+                              game.mineCount, game.seed, game._status, exploded)
+    offset = _snapshotHeader.size
+    for cells in (game._mines or (), masked, flagged):
+        _packBits(view[offset:offset + n], cells, cols)
+        offset += n
+    return buf
+
+
+def loadSnapshot(data, maxCells=MAX_CELLS):
+    """
+    Restore a game from a snapshot produced by dumpSnapshot. Accepts any buffer object.
+    """
+    view = memoryview(data)
+    if len(view) < _snapshotHeader.size:
+        raise SaveGameError('snapshot is truncated')
+    magic, version, difficulty, rows, cols, mineCount, seed, status, exploded = \
+        _snapshotHeader.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC or version != FORMAT_VERSION:
+        raise SaveGameError('not a MineSweeper snapshot')
+    n = (rows * cols + 7) // 8
+    if len(view) != _snapshotHeader.size + 3 * n:
+        raise SaveGameError('snapshot is truncated')
+    if status not in (MineSweeper.INIT, MineSweeper.PLAYING, MineSweeper.LOST, MineSweeper.WON):
+        raise SaveGameError(f'unknown game status {status}')
+    if exploded > rows * cols:
+        raise SaveGameError(f'exploded cell {exploded - 1} is outside the {rows}x{cols} board')
+    game = _newGame(difficulty, rows, cols, mineCount, seed, maxCells)
+
+    offset = _snapshotHeader.size
+    mines, masked, flagged = [
+        _unpackBits(view[offset + k * n:offset + (k + 1) * n], rows, cols) for k in range(3)]
+    # mines are only placed at the first click
+    expected = 0 if status == MineSweeper.INIT else mineCount
+    if len(mines) != expected:
+        raise SaveGameError(f'snapshot holds {len(mines)} mines, expected {expected}')
+    if status != MineSweeper.INIT:
+        game.placeMines(set(mines))
+    game._mask = [[MineSweeper.UNMASKED] * cols for _ in range(rows)]
+    for r, c in masked:
+        game._mask[r][c] = MineSweeper.MASKED
+    for r, c in flagged:
+        game._mask[r][c] = MineSweeper.FLAGGED
+    # numbers still hidden from the player are what stands between them and a win
+    game._numbers = {(r, c) for (r, c) in game._numbers
+                     if game._mask[r][c] != MineSweeper.UNMASKED}
+    if exploded:
+        r, c = divmod(exploded - 1, cols)
+        game._field[r][c] = '**'
+    game._status = status
+    game.generatePlayerBoard()
+    game._changes = {}
+    return game
+
+
+def saveGame(game, path):
+    with open(path, 'wb') as fp:
+        fp.write(memoryview(dumpSnapshot(game)))
+
+
+def loadGame(path, maxCells=MAX_CELLS):
+    with open(path, 'rb') as fp:
+        return loadSnapshot(fp.read(), maxCells)
+
+
+class MoveLog:
+    """
+    Append-only log of the moves applied to a game. Use apply() in place of calling the
+    game methods directly so that every move is recorded. A new log must be started before
+    the first move, an existing log can only be continued by the game it was started for,
+    and a log ends when its game is reset.
+    """
+
+    def __init__(self, path, game):
+        self.game = game
+        rows, cols = game.boardSize
+        header = _moveLogHeader.pack(MOVELOG_MAGIC, FORMAT_VERSION, _difficultyCode(game),
+                                     rows, cols, game.mineCount, game.seed)
+        self._fp = open(path, 'ab')
+        if self._fp.tell() == 0:
+            # the header only records the seed, so moves made before it would be lost
+            if game._status != MineSweeper.INIT:
+                self._fp.close()
+                raise SaveGameError('a move log must be started before the first move')
+            self._fp.write(header)
+        else:
+            with open(path, 'rb') as fp:
+                existing = fp.read(_moveLogHeader.size)
+            if existing != header:
+                self._fp.close()
+                raise SaveGameError(f'{path} is the move log of a different game')
+        # reset() replaces the board lists, which tells a reset game from the logged one
+        self._field = game._field
+
+    def apply(self, op, coord):
+        if self.game._field is not self._field:
+            raise SaveGameError('the game was reset, start a new move log for it')
+        code, action = MOVES[op]
+        rows, cols = self.game.boardSize
+        r, c = coord
+        # a record that cannot be replayed would make the whole log unreadable
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise SaveGameError(f'move {r, c} is outside the {rows}x{cols} board')
+        self._fp.write(_moveRecord.pack(code, r, c))
+        return action(self.game, (r, c))
+
+    def close(self):
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def replayMoveLog(data, maxCells=MAX_CELLS):
+    """
+    Re-run a move log on a fresh game and return the game and the number of moves applied.
+    """
+    view = memoryview(data)
+    if len(view) < _moveLogHeader.size:
+        raise SaveGameError('move log is truncated')
+    magic, version, difficulty, rows, cols, mineCount, seed = _moveLogHeader.unpack_from(view)
+    if magic != MOVELOG_MAGIC or version != FORMAT_VERSION:
+        raise SaveGameError('not a MineSweeper move log')
+    game = _newGame(difficulty, rows, cols, mineCount, seed, maxCells)
+
+    records = view[_moveLogHeader.size:]
+    # ignore a partially written trailing record
+    records = records[:len(records) - len(records) % _moveRecord.size]
+    count = 0
+    for code, r, c in _moveRecord.iter_unpack(records):
+        if code not in _movesByCode:
+            raise SaveGameError(f'unknown move code {code} in record {count}')
+        if not (r < rows and c < cols):
+            raise SaveGameError(f'move {r, c} in record {count} is outside the {rows}x{cols} board')
+        _movesByCode[code](game, (r, c))
+        count += 1
+    return game, count
+
+
+def replayMoveLogFile(path, maxCells=MAX_CELLS):
+    with open(path, 'rb') as fp:
+        return replayMoveLog(fp.read(), maxCells)
+
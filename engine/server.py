@@ -0,0 +1,162 @@
+"""
+Module implementing an asyncio game server hosting many MineSweeper sessions.
+
+The server speaks newline-delimited JSON over TCP. Every request is an object with an
+"op" field and an optional "id" that is echoed back in the response:
+
+    {"id": 1, "op": "new", "difficulty": "Easy"}
+    {"id": 1, "op": "new", "rows": 200, "cols": 300, "mines": 9000}
+    {"id": 2, "op": "click", "session": 7, "cell": [3, 4]}
+    {"id": 3, "op": "flag", "session": 7, "cell": [0, 0]}
+    {"id": 4, "op": "chord", "session": 7, "cell": [3, 4]}
+    {"id": 5, "op": "close", "session": 7}
+
+Move responses only carry the cells that changed as [row, col, value] triples, so a
+client keeps its own copy of the player board and patches it.
+Sessions that receive no request for idleTimeout seconds are evicted. Custom boards larger
+than maxCells cells are rejected, since every game lives in the server's memory and large
+boards are played on the event loop.
+"""
+import asyncio
+import itertools
+import json
+import time
+
+from .minesweeper import MineSweeper, GAME_DIFFICULTY_SETTING
+
+
+class Session:
+    def __init__(self, sessionID, difficulty='Easy', size=None, mines=None):
+        self.sessionID = sessionID
+        self.game = MineSweeper(difficulty=difficulty, size=size, mines=mines)
+        self.lastActive = time.monotonic()
+
+    def touch(self):
+        self.lastActive = time.monotonic()
+
+
+class GameServer:
+    moves = {
+        'click': MineSweeper.judge,
+        'flag': MineSweeper.flagCell,
+        'chord': MineSweeper.chordCell,
+    }
+
+    def __init__(self, host='127.0.0.1', port=8765, idleTimeout=300, sweepInterval=10,
+                 maxCells=250000):
+        self.host = host
+        self.port = port
+        self.idleTimeout = idleTimeout
+        self.maxCells = maxCells
+        self.sweepInterval = sweepInterval
+        self.sessions = {}
+        self._sessionIDs = itertools.count(1)
+        self._server = None
+        self._sweeper = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handleConnection, self.host, self.port)
+        # report the actual port when an ephemeral one (0) was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.create_task(self.evictIdleSessions())
+
+    async def serveForever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def evictIdleSessions(self):
+        while True:
+            await asyncio.sleep(self.sweepInterval)
+            self.evict(time.monotonic() - self.idleTimeout)
+
+    def evict(self, deadline):
+        idle = [sid for sid, session in self.sessions.items() if session.lastActive < deadline]
+        for sid in idle:
+            del self.sessions[sid]
+        return len(idle)
+
+    async def handleConnection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the line exceeds the stream limit, the rest of it cannot be told apart
+                    # from the next request, so give up on the connection
+                    self.sendResponse(writer, {'id': None, 'ok': False, 'error': 'request too long'})
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    response = self.handleRequest(request)
+                except (ValueError, TypeError, KeyError) as e:
+                    requestID = request.get('id') if isinstance(request, dict) else None
+                    response = {'id': requestID, 'ok': False, 'error': str(e)}
+                self.sendResponse(writer, response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def sendResponse(writer, response):
+        writer.write(json.dumps(response, separators=(',', ':')).encode() + b'\n')
+
+    def handleRequest(self, request):
+        if not isinstance(request, dict):
+            raise TypeError('request must be a JSON object')
+        op = request['op']
+        response = {'id': request.get('id')}
+        if op == 'new':
+            if 'rows' in request:
+                rows, cols, mines = request['rows'], request['cols'], request['mines']
+                if not all(isinstance(n, int) and not isinstance(n, bool)
+                           for n in (rows, cols, mines)):
+                    raise TypeError('rows, cols and mines must be integers')
+                if rows * cols > self.maxCells:
+                    raise ValueError(f'a {rows}x{cols} board exceeds the limit of '
+                                     f'{self.maxCells} cells')
+                session = Session(next(self._sessionIDs), size=(rows, cols), mines=mines)
+            else:
+                difficulty = request.get('difficulty', 'Easy')
+                if difficulty not in GAME_DIFFICULTY_SETTING:
+                    raise ValueError(f'unknown difficulty {difficulty}')
+                session = Session(next(self._sessionIDs), difficulty)
+            self.sessions[session.sessionID] = session
+            size = session.game.getBoardSize()
+            response.update(ok=True, session=session.sessionID, rows=size.row, cols=size.col,
+                            mines=session.game.mineCount)
+            return response
+
+        session = self.sessions.get(request['session'])
+        if session is None:
+            raise KeyError(f'unknown session {request["session"]}')
+        session.touch()
+        if op == 'close':
+            del self.sessions[session.sessionID]
+            response['ok'] = True
+        elif op in self.moves:
+            game = session.game
+            r, c = request['cell']
+            size = game.getBoardSize()
+            if not (0 <= r < size.row and 0 <= c < size.col):
+                raise ValueError(f'cell {r, c} outside the board')
+            ok = self.moves[op](game, (r, c))
+            response.update(ok=ok, status=game.status,
+                            cells=[list(cell) for cell in game.getChangedCells()])
+        else:
+            raise ValueError(f'unknown op {op}')
+        return response
@@ -11,9 +11,20 @@ An open palm gesture will open the currently selected cell, if compliant with ga
 A fist gesture will flag the currently selected cell if the cell is currently masked. 
 '''
 
+import argparse
+
 from engine import GamePlay
 
 
 if __name__ == '__main__':
-    game = GamePlay('Easy')
+    parser = argparse.ArgumentParser(description='Play Minesweeper with hand gestures')
+    parser.add_argument('--difficulty', default='Easy', help='Easy, Intermediate or Hard')
+    parser.add_argument('--size', default=None, help='custom board size ROWSxCOLS, overrides --difficulty')
+    parser.add_argument('--mines', type=int, default=None, help='number of mines on a custom board')
+    parser.add_argument('--screen', default=None,
+                        help='screen profile name or WIDTHxHEIGHT, detected if omitted')
+    args = parser.parse_args()
+
+    size = tuple(int(n) for n in args.size.lower().split('x')) if args.size else None
+    game = GamePlay(args.difficulty, size=size, mines=args.mines, system=args.screen)
     game.startGame()
@@ -0,0 +1,136 @@
+'''
+Load generator for minesweeper_server.py.
+
+Opens a number of concurrent connections, each playing games back to back with random
+clicks and flags for a fixed duration, then reports requests/sec and latency percentiles.
+Every client keeps its own player board and patches it with the changed cells returned
+by the server.
+
+    python minesweeper_loadgen.py --connections 200 --duration 10
+    python minesweeper_loadgen.py --size 500x500 --mines 40000
+'''
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+class LoadClient:
+    def __init__(self, host, port, newGame, flagRatio=0.1):
+        self.host = host
+        self.port = port
+        self.newGame = newGame
+        self.flagRatio = flagRatio
+        self.latencies = []
+        self.errors = 0
+        self.gamesPlayed = 0
+        self._requestID = 0
+
+    async def request(self, reader, writer, message):
+        self._requestID += 1
+        message['id'] = self._requestID
+        t0 = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            self.errors += 1
+            raise ConnectionResetError('server closed the connection')
+        response = json.loads(line)
+        self.latencies.append(time.perf_counter() - t0)
+        if 'error' in response:
+            self.errors += 1
+        return response
+
+    async def run(self, deadline):
+        # a fully revealed large board can exceed the default 64 KiB line limit
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=2**24)
+        try:
+            while time.perf_counter() < deadline:
+                if not await self.playGame(reader, writer, deadline):
+                    break
+        except ConnectionError as e:
+            # a dropped connection only ends this client, the others keep running
+            print(f'connection lost: {e}')
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def playGame(self, reader, writer, deadline):
+        game = await self.request(reader, writer, dict(op='new', **self.newGame))
+        if not game.get('ok'):
+            # the server refused the game, e.g. a board over its size limit; nothing to play
+            print(f'new game failed: {game.get("error")}')
+            return False
+        session = game['session']
+        board = {(r, c): '?' for r in range(game['rows']) for c in range(game['cols'])}
+        status = 'playing'
+        while status == 'playing' and time.perf_counter() < deadline:
+            cell = self.pickMaskedCell(board, game['rows'], game['cols'])
+            if cell is None:
+                break
+            op = 'flag' if random.random() < self.flagRatio else 'click'
+            response = await self.request(reader, writer,
+                                          {'op': op, 'session': session, 'cell': list(cell)})
+            for r, c, value in response.get('cells', []):
+                board[(r, c)] = value
+            status = response.get('status', status)
+        await self.request(reader, writer, {'op': 'close', 'session': session})
+        self.gamesPlayed += 1
+        return True
+
+    @staticmethod
+    def pickMaskedCell(board, rows, cols, tries=20):
+        # random probing keeps the client cheap on huge boards, scan only when it keeps missing
+        for _ in range(tries):
+            cell = (random.randrange(rows), random.randrange(cols))
+            if board[cell] in ('?', 'F'):
+                return cell
+        masked = [cell for cell, value in board.items() if value in ('?', 'F')]
+        return random.choice(masked) if masked else None
+
+
+def percentile(sortedValues, p):
+    if not sortedValues:
+        return 0.0
+    index = min(len(sortedValues) - 1, int(round(p / 100 * (len(sortedValues) - 1))))
+    return sortedValues[index]
+
+
+async def runLoad(host, port, connections, duration, newGame):
+    clients = [LoadClient(host, port, newGame) for _ in range(connections)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client.run(t0 + duration) for client in clients))
+    elapsed = time.perf_counter() - t0
+
+    latencies = sorted(l for client in clients for l in client.latencies)
+    print(f'connections: {connections}  duration: {elapsed:.2f} s  '
+          f'games: {sum(c.gamesPlayed for c in clients)}  errors: {sum(c.errors for c in clients)}')
+    print(f'requests: {len(latencies)}  throughput: {len(latencies) / elapsed:.0f} req/s')
+    print('latency ms  ' + '  '.join(f'p{p}: {percentile(latencies, p) * 1000:.2f}'
+                                     for p in (50, 90, 99, 99.9)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MineSweeper server load generator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--difficulty', default='Easy')
+    parser.add_argument('--size', default=None, help='custom board size ROWSxCOLS, overrides --difficulty')
+    parser.add_argument('--mines', type=int, default=None, help='number of mines on a custom board')
+    args = parser.parse_args()
+
+    if args.size:
+        if args.mines is None:
+            parser.error('--mines is required with --size')
+        rows, cols = (int(n) for n in args.size.lower().split('x'))
+        newGame = {'rows': rows, 'cols': cols, 'mines': args.mines}
+    else:
+        newGame = {'difficulty': args.difficulty}
+    asyncio.run(runLoad(args.host, args.port, args.connections, args.duration, newGame))
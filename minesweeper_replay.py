@@ -0,0 +1,51 @@
+'''
+Replay MineSweeper move logs headlessly and check their final states.
+
+For every log, the final state is compared against the snapshot with the same name and
+a .msav suffix when one exists. Pass --save to write those snapshots instead.
+
+    python minesweeper_replay.py games/*.mlog
+'''
+import argparse
+import os
+import sys
+import time
+
+from engine.savegame import replayMoveLogFile, dumpSnapshot, saveGame, SaveGameError
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay MineSweeper move logs')
+    parser.add_argument('logs', nargs='+', help='move log files')
+    parser.add_argument('--save', action='store_true',
+                        help='write the final state of every log as its expected snapshot')
+    args = parser.parse_args()
+
+    failures = 0
+    totalMoves = 0
+    t0 = time.perf_counter()
+    for path in args.logs:
+        snapshotPath = os.path.splitext(path)[0] + '.msav'
+        try:
+            game, moves = replayMoveLogFile(path)
+        except (OSError, SaveGameError) as e:
+            print(f'{path}: ERROR {e}')
+            failures += 1
+            continue
+        totalMoves += moves
+        if args.save:
+            saveGame(game, snapshotPath)
+            result = f'saved {snapshotPath}'
+        elif os.path.exists(snapshotPath):
+            with open(snapshotPath, 'rb') as fp:
+                matches = fp.read() == dumpSnapshot(game)
+            result = 'OK' if matches else 'MISMATCH'
+            failures += not matches
+        else:
+            result = 'no snapshot to check'
+        print(f'{path}: {moves} moves, {game.status}, {result}')
+    elapsed = time.perf_counter() - t0
+
+    print(f'replayed {len(args.logs)} logs, {totalMoves} moves in {elapsed:.3f} s '
+          f'({totalMoves / max(elapsed, 1e-9):.0f} moves/s), {failures} failed')
+    sys.exit(1 if failures else 0)
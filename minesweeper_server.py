@@ -0,0 +1,27 @@
+'''
+Host many MineSweeper games over TCP.
+
+Run `python minesweeper_server.py --port 8765` and connect with a newline-delimited JSON
+client, e.g. minesweeper_loadgen.py. See engine/server.py for the protocol.
+'''
+import argparse
+import asyncio
+
+from engine import GameServer
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MineSweeper game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--idle-timeout', type=float, default=300,
+                        help='seconds without requests before a session is evicted')
+    parser.add_argument('--max-cells', type=int, default=250000,
+                        help='largest custom board (rows * cols) a client may create')
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, idleTimeout=args.idle_timeout, maxCells=args.max_cells)
+    try:
+        asyncio.run(server.serveForever())
+    except KeyboardInterrupt:
+        pass
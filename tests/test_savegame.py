@@ -0,0 +1,101 @@
+import random
+import struct
+
+import pytest
+
+from engine import MineSweeper, MoveLog
+from engine.savegame import dumpSnapshot, loadSnapshot, replayMoveLogFile, SaveGameError
+
+BOARDS = [{'difficulty': 'Easy'}, {'difficulty': 'Hard'}, {'size': (7, 13), 'mines': 20}]
+
+
+def playLoggedGame(path, board, seed, moves, rng):
+    game = MineSweeper(seed=seed, **board)
+    rows, cols = game.getBoardSize()
+    with MoveLog(path, game) as log:
+        for _ in range(moves):
+            op = rng.choice(['click', 'click', 'flag', 'chord'])
+            log.apply(op, (rng.randrange(rows), rng.randrange(cols)))
+    return game
+
+
+@pytest.mark.parametrize('board', BOARDS)
+def test_snapshot_round_trip(tmp_path, board):
+    rng = random.Random(1)
+    for seed in range(20):
+        game = playLoggedGame(tmp_path / f'{seed}.mlog', board, seed, rng.randrange(40), rng)
+        snapshot = dumpSnapshot(game)
+        restored = loadSnapshot(snapshot)
+        assert dumpSnapshot(restored) == snapshot
+        assert restored.getPlayerBoard() == game.getPlayerBoard()
+        assert restored.status == game.status
+
+
+@pytest.mark.parametrize('board', BOARDS)
+def test_replay_matches_live_game(tmp_path, board):
+    rng = random.Random(2)
+    for seed in range(20):
+        path = tmp_path / f'{seed}.mlog'
+        moves = rng.randrange(40)
+        game = playLoggedGame(path, board, seed, moves, rng)
+        replayed, count = replayMoveLogFile(path)
+        assert count == moves
+        assert dumpSnapshot(replayed) == dumpSnapshot(game)
+
+
+def test_corrupt_move_log(tmp_path):
+    path = tmp_path / 'game.mlog'
+    playLoggedGame(path, {'difficulty': 'Easy'}, 0, 3, random.Random(3))
+    valid = path.read_bytes()
+    for record in [struct.pack('<BHH', 9, 0, 0), struct.pack('<BHH', 1, 9, 0)]:
+        path.write_bytes(valid + record)
+        with pytest.raises(SaveGameError):
+            replayMoveLogFile(path)
+
+
+def test_move_log_refuses_other_game(tmp_path):
+    path = tmp_path / 'game.mlog'
+    game = playLoggedGame(path, {'difficulty': 'Easy'}, 0, 3, random.Random(4))
+    with pytest.raises(SaveGameError):
+        MoveLog(path, MineSweeper('Hard', seed=0))
+    with MoveLog(path, game) as log:
+        game.reset()
+        with pytest.raises(SaveGameError):
+            log.apply('click', (0, 0))
+
+
+def test_move_log_refuses_moves_outside_board(tmp_path):
+    path = tmp_path / 'game.mlog'
+    game = MineSweeper('Easy', seed=0)
+    with MoveLog(path, game) as log:
+        log.apply('click', (4, 4))
+        for coord in [(9, 0), (0, -1)]:
+            with pytest.raises(SaveGameError):
+                log.apply('flag', coord)
+    replayed, count = replayMoveLogFile(path)
+    assert count == 1 and dumpSnapshot(replayed) == dumpSnapshot(game)
+
+
+def test_move_log_refuses_game_in_progress(tmp_path):
+    path = tmp_path / 'game.mlog'
+    game = MineSweeper('Easy', seed=0)
+    game.judge((4, 4))
+    with pytest.raises(SaveGameError):
+        MoveLog(path, game)
+
+
+def test_corrupt_snapshot():
+    game = MineSweeper('Easy', seed=0)
+    game.judge((4, 4))
+    valid = dumpSnapshot(game)
+    # status and exploded cell are the last header fields, the mine bitset follows the header
+    firstMine = next(i for i in range(27, len(valid)) if valid[i])
+    for offset, field in [(22, struct.pack('<B', 9)), (23, struct.pack('<I', 82)),
+                          (firstMine, bytes([valid[firstMine] & valid[firstMine] - 1]))]:
+        corrupt = bytearray(valid)
+        corrupt[offset:offset + len(field)] = field
+        with pytest.raises(SaveGameError):
+            loadSnapshot(corrupt)
+    for seed in [-1, 2 ** 64]:
+        with pytest.raises(ValueError):
+            MineSweeper('Easy', seed=seed)
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from engine import MineSweeper, GameServer
+
+
+def test_changed_cells_patch_player_board():
+    rng = random.Random(0)
+    for difficulty in ['Easy', 'Intermediate', 'Hard']:
+        for seed in range(20):
+            game = MineSweeper(difficulty, seed=seed)
+            rows, cols = game.getBoardSize()
+            board = [['?'] * cols for _ in range(rows)]
+            for _ in range(60):
+                action = rng.choice([game.judge, game.judge, game.flagCell, game.chordCell])
+                action((rng.randrange(rows), rng.randrange(cols)))
+                for r, c, value in game.getChangedCells():
+                    board[r][c] = value
+                assert board == game.getPlayerBoard()
+
+
+def test_custom_board_validation():
+    for size, mines in [((0, 5), 0), ((5, 65536), 0), ((5, 5), 17), ((5, 5), -1),
+                        ((1, 5), 1), ((5, 5), 10.5), ((5, 5), True), ((5, 5), None)]:
+        with pytest.raises((ValueError, TypeError)):
+            MineSweeper(size=size, mines=mines)
+    # mines are kept out of the first click's row and column, so a 1xN board has none
+    game = MineSweeper(size=(1, 5), mines=0, seed=0)
+    game.judge((0, 2))
+    assert game.status == 'won'
+    for seed in range(20):
+        game = MineSweeper(size=(5, 7), mines=24, seed=seed)
+        game.judge((2, 3))
+        assert len(game._mines) == 24 and game.getPlayerBoard()[2][3] == 4
+        assert all(r != 2 and c != 3 for r, c in game._mines)
+
+
+def test_server_round_trip():
+    async def play():
+        server = GameServer(port=0, maxCells=100)
+        await server.start()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+
+        async def request(message):
+            writer.write(json.dumps(message).encode() + b'\n')
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        try:
+            game = await request({'id': 1, 'op': 'new', 'difficulty': 'Easy'})
+            assert game['ok'] and game['id'] == 1 and (game['rows'], game['cols']) == (9, 9)
+            move = await request({'id': 2, 'op': 'click', 'session': game['session'], 'cell': [4, 4]})
+            assert move['ok'] and move['id'] == 2
+            # the first click opens at least the clicked cell and only reports changed cells
+            assert [4, 4, 0] in move['cells'] and all(value != '?' for _, _, value in move['cells'])
+
+            refused = await request({'id': 3, 'op': 'new', 'rows': 20, 'cols': 20, 'mines': 10})
+            assert refused == {'id': 3, 'ok': False, 'error': refused['error']}
+            refused = await request({'id': 3, 'op': 'new', 'rows': 5, 'cols': 5, 'mines': 2.5})
+            assert refused == {'id': 3, 'ok': False, 'error': refused['error']}
+            custom = await request({'id': 3, 'op': 'new', 'rows': 5, 'cols': 20, 'mines': 76})
+            assert custom['ok'] and (custom['rows'], custom['cols'], custom['mines']) == (5, 20, 76)
+            move = await request({'id': 3, 'op': 'click', 'session': custom['session'],
+                                  'cell': [2, 9]})
+            # every cell off the clicked row and column is a mine, so only the clicked cell opens
+            assert move['cells'] == [[2, 9, 4]] and move['status'] == 'playing'
+            await request({'id': 3, 'op': 'close', 'session': custom['session']})
+            closed = await request({'id': 4, 'op': 'close', 'session': game['session']})
+            assert closed['ok'] and not server.sessions
+        finally:
+            writer.close()
+            await server.close()
+
+    asyncio.run(play())